@@ -95,6 +95,8 @@ class EvaluationFunction:
             evaluation of board state
     """
 
+    __slots__ = ("name", "evaluations", "piece_values")
+
     def __init__(self):
         self.name: str = "Base Evaluation Function"
         self.evaluations: Dict[str, int] = {}
@@ -119,6 +121,8 @@ class StandardEvaluation(EvaluationFunction):
     sides according to the standard piece valuation and calculates
     difference as metric """
 
+    __slots__ = ()
+
     def __init__(self):
         """ See parent docstring """
         super().__init__()
@@ -163,6 +167,8 @@ class PiecePositionEvaluation(EvaluationFunction):
             value tables. Default to conventional piece table
     """
 
+    __slots__ = ("value_tables",)
+
     def __init__(self):
         """ See parent docstring """
         super().__init__()
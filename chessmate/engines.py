@@ -8,6 +8,7 @@ import chess  # type: ignore
 import chess.pgn  # type: ignore
 
 from chessmate.analysis import StandardEvaluation
+from chessmate.constants.misc import PIECE_NAMES
 from chessmate.constants.piece_values import ConventionalPieceValues
 from chessmate.heuristics import MVV_LVA
 from chessmate.transpositions import TranspositionTable, zobrist_hash_function
@@ -227,13 +228,13 @@ class CaptureHighestValue(BaseEngine):
 
         legal_move_list = list(board.legal_moves)
         for m in legal_move_list:
-            piece_at_position = get_piece_at(board, str(m)[2:4]).upper()
+            captured_type = board.piece_type_at(m.to_square)
 
-            if (not board.is_capture(m)) or (not piece_at_position):
+            if (not board.is_capture(m)) or (not captured_type):
                 self.legal_moves[m] = 0.0
             else:
                 self.legal_moves[m] = self.value_mapping[
-                    piece_at_position
+                    PIECE_NAMES[captured_type]
                 ].value
 
         self.material_difference.append(
@@ -418,6 +419,22 @@ class MiniMax(BaseEngine):
             depth (int): depth to search. Init at self._depth for base. Note:
                 depth=>3 will be computationally slow for most CPUs
         """
+        # Hash root board once, child boards are hashed incrementally
+        self.transposition_table.set_current_board(base_board)
+        return self._minimax(base_board, maximizing, depth, alpha, beta)
+
+    def _minimax(
+        self,
+        base_board: chess.Board,
+        maximizing: bool,
+        depth: int,
+        alpha: float,
+        beta: float,
+    ) -> float:
+        """
+        Recursive step of minimax. Assumes transposition_table.current_hash
+        is hash of base_board. See minimax docstring
+        """
         if depth == 0 or base_board.is_game_over():
             return self.evaluation_function.evaluate(base_board)
 
@@ -434,20 +451,21 @@ class MiniMax(BaseEngine):
                 random.shuffle(legal_moves)
 
             for move in legal_moves:
+                # Incrementally hash board after move and check for
+                # stored evaluation in transposition table
+                hash_ = self.transposition_table.update_hash(move, base_board)
                 base_board.push_uci(str(move))
-                # Hash current board and check for membership in transposition
-                # table
-                hash_ = self.transposition_table.hash_current_board(base_board)
-                if hash_ in self.transposition_table:
-                    val = self.transposition_table.stored_values[hash_]
-                else:
+                val = self.transposition_table.get(hash_)
+                if val is None:
                     # If current board not yet hashed, use minimax to eval
-                    val = self.minimax(
+                    val = self._minimax(
                         base_board, False, depth - 1, alpha, beta
                     )
                     # Store hash with evaluation of entire branch
-                    self.transposition_table.stored_values[hash_] = val
+                    self.transposition_table[hash_] = val
                 popped_move = base_board.pop()
+                # Undo move in hash
+                self.transposition_table.update_hash(popped_move, base_board)
 
                 if val > max_val:
                     max_val = val
@@ -473,16 +491,16 @@ class MiniMax(BaseEngine):
                 random.shuffle(legal_moves)
 
             for move in legal_moves:
+                hash_ = self.transposition_table.update_hash(move, base_board)
                 base_board.push_uci(str(move))
-                hash_ = self.transposition_table.hash_current_board(base_board)
-                if hash_ in self.transposition_table:
-                    val = self.transposition_table.stored_values[hash_]
-                else:
-                    val = self.minimax(
+                val = self.transposition_table.get(hash_)
+                if val is None:
+                    val = self._minimax(
                         base_board, True, depth - 1, alpha, beta
                     )
-                    self.transposition_table.stored_values[hash_] = val
+                    self.transposition_table[hash_] = val
                 popped_move = base_board.pop()
+                self.transposition_table.update_hash(popped_move, base_board)
 
                 if val < min_val:
                     min_val = val
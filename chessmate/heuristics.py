@@ -5,8 +5,8 @@ from typing import Dict, List
 
 import chess  # type: ignore
 
+from chessmate.constants.misc import PIECE_NAMES
 from chessmate.constants.piece_values import ConventionalPieceValues
-from chessmate.utils import get_piece_at
 
 
 def MVV_LVA(
@@ -29,12 +29,12 @@ def MVV_LVA(
     for move in move_list:
         if board.is_capture(move):
             # Get difference in value between aggressor and victim pieces
-            aggressor_piece = get_piece_at(board, str(move)[:2]).upper()
-            victim_piece = get_piece_at(board, str(move)[2:]).upper()
-            if aggressor_piece and victim_piece:
+            aggressor_type = board.piece_type_at(move.from_square)
+            victim_type = board.piece_type_at(move.to_square)
+            if aggressor_type and victim_type:
                 value_diff = (
-                    piece_values[victim_piece].value
-                    - piece_values[aggressor_piece].value
+                    piece_values[PIECE_NAMES[victim_type]].value
+                    - piece_values[PIECE_NAMES[aggressor_type]].value
                 )
 
                 if value_diff not in available_captures:
@@ -1,35 +1,156 @@
 """ Functions related to hash_tableing and transposition tables """
-import random
-from typing import Dict, List
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional
 
 import chess  # type: ignore
+import numpy as np  # type: ignore
 
 from chessmate.analysis import StandardEvaluation
 from chessmate.constants.misc import PIECE_INDEXING
-from chessmate.utils import get_piece_at, is_valid_fen
+from chessmate.utils import is_valid_fen
+
+# Maps [piece_type, color] of python-chess pieces to PIECE_INDEXING so pieces
+# can be indexed without building their symbol strings. piece_type is 1
+# indexed, so row 0 is unused
+_PIECE_IDX_LUT = np.full((7, 2), -1, dtype=np.int64)
+for _piece_type in chess.PIECE_TYPES:
+    for _color in chess.COLORS:
+        _PIECE_IDX_LUT[_piece_type, int(_color)] = PIECE_INDEXING[
+            chess.Piece(_piece_type, _color).symbol()
+        ]
+
+# Number of entries per bucket of a TranspositionTable. Entries hashing to a
+# full bucket evict the least frequently accessed entry of that bucket
+BUCKET_SIZE = 4
+# Hashes are stored as unsigned 64 bit ints
+_HASH_MASK = (1 << 64) - 1
+
+# Generator shared by all unseeded hash tables so entropy is only gathered
+# once
+_RNG = np.random.default_rng()
+# Default seed so hash tables, and hence hashes, are identical across runs
+DEFAULT_SEED = 0xC0FFEE
+# Shift of each square's bit within a bitboard
+_SQUARE_SHIFTS = np.arange(64, dtype=np.uint64)
+
+
+def _zobrist_xor_numpy(
+    bitboards: np.ndarray, hash_table: np.ndarray
+) -> np.uint64:
+    """
+    XORs together hash_table values of every set bit of each piece's
+    bitboard via. a numpy gather + reduce. Used when numba isn't installed
+
+    Args:
+        bitboards (np.ndarray): bitboard of each piece in PIECE_INDEXING
+            order
+        hash_table (np.ndarray): (12, 64) hash table
+    Returns:
+        (np.uint64)
+    """
+    # (12, 64) mask of occupied squares lines up with hash_table rows
+    occupied = (bitboards[:, None] >> _SQUARE_SHIFTS) & np.uint64(1)
+    return np.bitwise_xor.reduce(hash_table[occupied.astype(bool)])
+
+
+# numba is an optional extra (pip install numba) - fall back to numpy
+# kernel if not installed
+try:
+    from numba import njit  # type: ignore
+except ImportError:
+    njit = None
+
+
+if njit is not None:
+
+    @njit(cache=True, nogil=True)
+    def _zobrist_xor_jit(
+        bitboards: np.ndarray, hash_table: np.ndarray
+    ) -> np.uint64:
+        """
+        Compiled equivalent of _zobrist_xor_numpy. Explicit loop since numba
+        compiles it without allocating the temporary arrays a numpy gather +
+        reduce requires
+        """
+        _hash = np.uint64(0)
+        for piece_idx in range(bitboards.shape[0]):
+            bitboard = bitboards[piece_idx]
+            square = 0
+            while bitboard:
+                if bitboard & np.uint64(1):
+                    _hash ^= hash_table[piece_idx, square]
+                bitboard >>= np.uint64(1)
+                square += 1
+        return _hash
+
+    _zobrist_xor = _zobrist_xor_jit
+else:
+    _zobrist_xor = _zobrist_xor_numpy
+
+
+def _generate_hash_table(rng: np.random.Generator) -> np.ndarray:
+    """
+    Generates (piece index, square) table of nonzero zobrist keys. Raw 64
+    bit generator output skips bounded integer sampling
+
+    Args:
+        rng (np.random.Generator)
+    Returns:
+        (np.ndarray): (12, 64) uint64 table
+    """
+    hash_table = rng.bit_generator.random_raw(12 * 64).reshape(12, 64)
+    hash_table[hash_table == 0] = 1
+    return hash_table
 
 
-def zobrist_hash_function(board: chess.Board, hash_table: List) -> int:
+@lru_cache(maxsize=None)
+def _seeded_hash_table(seed: int) -> np.ndarray:
+    """
+    Generates hash table for seed once. Copy before use since cached
+
+    Args:
+        seed (int)
+    Returns:
+        (np.ndarray): (12, 64) uint64 table
+    """
+    return _generate_hash_table(np.random.default_rng(seed))
+
+
+def zobrist_hash_function(board: chess.Board, hash_table: np.ndarray) -> int:
     """
     Hashes board according to Zobrist hash schema
 
     Args:
         board (chess.Board): boardstate
-        hash_table (List): randomly generated hash table
+        hash_table (np.ndarray): randomly generated hash table of shape
+            (12, 64) indexed by [piece index, square]
     Returns:
         (int): hashed board
     """
-    _hash = 0
-    for square in chess.SQUARES:
-        piece = get_piece_at(board=board, position=square)
-        # If piece on square, hash piece based off piece identity and position
-        if piece:
-            piece_idx = PIECE_INDEXING[piece]
-            rank, _file = chess.square_rank(square), chess.square_file(square)
-            # Bitwise XOR on _hash
-            _hash ^= hash_table[rank][_file][piece_idx]
+    white = board.occupied_co[chess.WHITE]
+    black = board.occupied_co[chess.BLACK]
+    if not white | black:
+        return 0
 
-    return _hash
+    # Bitboard of each piece in PIECE_INDEXING order i.e P, p, N, n, ... so
+    # only occupied squares are visited, grouped by hash_table row
+    bitboards = np.array(
+        [
+            piece_mask & color_mask
+            for piece_mask in (
+                board.pawns,
+                board.knights,
+                board.bishops,
+                board.rooks,
+                board.queens,
+                board.kings,
+            )
+            for color_mask in (white, black)
+        ],
+        dtype=np.uint64,
+    )
+    return int(_zobrist_xor(bitboards, hash_table))
 
 
 class TranspositionTable:
@@ -38,14 +159,30 @@ class TranspositionTable:
 
     Attributes:
         hash_function (Callable): function that hashed board to int
-        hash_table (List): hash table to feed into hash function.
-            Randomly generated by default
-        evaluation_function: function to evaluate boardstate
-        stored_values (Dict[int, int]): table to store results
+        hash_table (np.ndarray): (12, 64) hash table to feed into hash
+            function, indexed by [piece index, square]. Generated from
+            seed by default
+        evaluation_function: class of function to evaluate boardstate.
+            Instantiated once when set
+        size (int): maximum number of stored evaluations. Stored in buckets
+            of BUCKET_SIZE entries indexed by the low bits of the hash
+        stored_values (Mapping[int, float]): read-only snapshot of all stored
+            hashes and evaluations. Store evaluations via.
+            table[hash] = evaluation; writing to stored_values raises
+            TypeError
+        current_hash (int): hash of board being tracked incrementally via.
+            update_hash
 
     Methods:
         hash_current_board (chess.Board): hashes current board WITHOUT storing
             value. Used for checking membership
+        set_current_board (chess.Board): resets current_hash to full hash of
+            board. Used as starting point for incremental updates and
+            starts a new search generation for aging access counts
+        update_hash (chess.Move, chess.Board): XORs move into current_hash
+            without rehashing entire board
+        get (int): gets stored evaluation of hash via. a single lookup, None
+            if hash not stored
         get_evaluation_from_fen (fen): gets evaluation of FEN board position
             from stored_values if position previously evaluated
         store_current_board (chess.Board): hashes and evaluates
@@ -53,38 +190,211 @@ class TranspositionTable:
             respectively, store hashed board eval in stored_values
     """
 
-    def __init__(self, hash_function):
+    __slots__ = (
+        "hash_function",
+        "_hash_table",
+        "_evaluation_cls",
+        "_evaluator",
+        "_current_hash",
+        "_bucket_mask",
+        "_entries",
+        "_index",
+        "_generation",
+    )
+
+    def __init__(
+        self,
+        hash_function,
+        size: int = 2 ** 20,
+        seed: Optional[int] = DEFAULT_SEED,
+    ):
+        """
+        Args:
+            hash_function (Callable): function that hashes board to int
+            size (int): maximum number of stored evaluations. Must be a
+                power of 2 no smaller than BUCKET_SIZE. Default = 2 ** 20
+            seed (Optional[int]): seed for generating hash_table. Tables
+                with same seed are identical. None for a random table.
+                Default = DEFAULT_SEED
+        Raises:
+            ValueError: if size is not a valid table size
+        """
+        if size < BUCKET_SIZE or size & (size - 1):
+            raise ValueError(f"size {size} not a power of 2 >= {BUCKET_SIZE}")
         self.hash_function = hash_function
-        self._hash_table = [
-            [
-                [random.randint(1, 2 ** 64 - 1) for i in range(12)]
-                for j in range(8)
-            ]
-            for k in range(8)
-        ]
-        self.evaluation_function = StandardEvaluation
-        self.stored_values: Dict[int, int] = {}
+        # Single contiguous (piece index, square) table of nonzero keys
+        if seed is None:
+            self._hash_table: np.ndarray = _generate_hash_table(_RNG)
+        else:
+            self._hash_table = _seeded_hash_table(seed).copy()
+        self._evaluation_cls = StandardEvaluation
+        self._evaluator = self._evaluation_cls()
+        self._current_hash: int = 0
+
+        # Fixed size storage so table doesn't grow unbounded during search.
+        # Bucket b is slots [b * BUCKET_SIZE, (b + 1) * BUCKET_SIZE) of a
+        # flat list, each slot None or a [key, value, count, generation]
+        # entry. Entries are also indexed by key so lookups are a single
+        # dict probe rather than a scan of the bucket
+        self._bucket_mask: int = size // BUCKET_SIZE - 1
+        self._entries: List[Optional[list]] = [None] * size
+        self._index: Dict[int, list] = {}
+        # Incremented per search via. set_current_board. Access counts are
+        # halved for every generation since an entry was last accessed, so
+        # entries hot in previous searches age out
+        self._generation: int = 0
 
     def __len__(self):
-        return len(self.stored_values)
+        return len(self._index)
+
+    def __contains__(self, hash_val: int) -> bool:
+        return self._key(hash_val) in self._index
+
+    def __getitem__(self, hash_val: int) -> float:
+        evaluation = self.get(hash_val)
+        if evaluation is None:
+            raise KeyError(hash_val)
+        return evaluation
+
+    def __setitem__(self, hash_val: int, evaluation: float) -> None:
+        if not isinstance(hash_val, int):
+            hash_val = self._key(hash_val)
+        key = hash_val & _HASH_MASK
+        entry = self._index.get(key)
+        if entry is not None:
+            self._touch(entry)
+            entry[1] = evaluation
+            return
+
+        slot = self._evict_slot((key & self._bucket_mask) * BUCKET_SIZE)
+        evicted = self._entries[slot]
+        if evicted is not None:
+            del self._index[evicted[0]]
+        entry = [key, evaluation, 1, self._generation]
+        self._entries[slot] = entry
+        self._index[key] = entry
+
+    @staticmethod
+    def _key(hash_val: int) -> int:
+        """
+        Converts hash to key entries are stored under
+
+        Args:
+            hash_val (int)
+        Raises:
+            TypeError: if hash not int. str hashes would silently never match
+        Returns:
+            (int): hash as unsigned 64 bit int
+        """
+        if not isinstance(hash_val, (int, np.integer)):
+            raise TypeError(f"hash {hash_val} of type {type(hash_val)}")
+        return int(hash_val) & _HASH_MASK
+
+    def _evict_slot(self, start: int) -> int:
+        """
+        Selects slot of bucket for new entry. Fills empty slot if bucket has
+        one, otherwise replaces entry with lowest aged access count
 
-    def __contains__(self, hash_str: str) -> bool:
-        return hash_str in self.stored_values
+        Args:
+            start (int): first slot of bucket
+        Returns:
+            (int)
+        """
+        entries = self._entries
+        generation = self._generation
+        evict_slot, evict_count = start, None
+        for slot in range(start, start + BUCKET_SIZE):
+            entry = entries[slot]
+            if entry is None:
+                return slot
+            count = entry[2] >> (generation - entry[3])
+            if evict_count is None or count < evict_count:
+                evict_slot, evict_count = slot, count
+        return evict_slot
+
+    def _touch(self, entry: list) -> None:
+        """
+        Ages access count of entry to current generation and counts access
+
+        Args:
+            entry (list): [key, value, count, generation] entry
+        """
+        entry[2] = (entry[2] >> (self._generation - entry[3])) + 1
+        entry[3] = self._generation
+
+    def get(self, hash_val: int) -> Optional[float]:
+        """
+        Gets stored evaluation of hash. Single lookup in place of checking
+        membership then indexing
+
+        Args:
+            hash_val (int)
+        Returns:
+            (Optional[float]): evaluation, None if hash not stored
+        """
+        # Key conversion and aging inlined since called once per search node
+        if not isinstance(hash_val, int):
+            hash_val = self._key(hash_val)
+        entry = self._index.get(hash_val & _HASH_MASK)
+        if entry is None:
+            return None
+        generation = self._generation
+        entry[2] = (entry[2] >> (generation - entry[3])) + 1
+        entry[3] = generation
+        return entry[1]
+
+    @property
+    def stored_values(self) -> Mapping[int, float]:
+        """ Getter for read-only snapshot of stored hashes mapped to
+        evaluations """
+        return MappingProxyType(
+            {key: entry[1] for key, entry in self._index.items()}
+        )
 
     @property
-    def hash_table(self) -> List:
+    def hash_table(self) -> np.ndarray:
         """ Getter for hash_table """
         return self._hash_table
 
     @hash_table.setter
-    def hash_table(self, new_hash_table: List):
+    def hash_table(self, new_hash_table: np.ndarray):
         """
-        Setter for hash_table
+        Setter for hash_table. Validated since hash functions index table
+        without bounds checking
 
         Args:
-            new_hash_table (List)
+            new_hash_table (np.ndarray): uint64 table of shape (12, 64)
+        Raises:
+            ValueError: if table is not a (12, 64) uint64 array
         """
-        self._hash_table = new_hash_table
+        if (
+            not isinstance(new_hash_table, np.ndarray)
+            or new_hash_table.shape != (12, 64)
+            or new_hash_table.dtype != np.uint64
+        ):
+            raise ValueError(
+                "hash_table must be a (12, 64) uint64 array indexed by "
+                "[piece index, square]"
+            )
+        self._hash_table = np.ascontiguousarray(new_hash_table)
+
+    @property
+    def evaluation_function(self):
+        """ Getter for evaluation_function """
+        return self._evaluation_cls
+
+    @evaluation_function.setter
+    def evaluation_function(self, evaluation_cls) -> None:
+        """
+        Setter for evaluation_function. Instantiates evaluation function
+        once here rather than on every stored board
+
+        Args:
+            evaluation_cls (analysis.EvaluationFunction): class of
+                evaluation function
+        """
+        self._evaluation_cls = evaluation_cls
+        self._evaluator = evaluation_cls()
 
     def hash_current_board(self, board: chess.Board) -> int:
         """
@@ -97,7 +407,90 @@ class TranspositionTable:
         """
         return self.hash_function(board, self._hash_table)
 
-    def get_evaluation_from_fen(self, fen: str) -> int:
+    @property
+    def current_hash(self) -> int:
+        """ Getter for current_hash """
+        return self._current_hash
+
+    def set_current_board(self, board: chess.Board) -> int:
+        """
+        Hashes board from scratch and tracks it as current_hash. Must be
+        called before incrementally updating hash via. update_hash
+
+        Args:
+            board (chess.Board): board state
+        Returns:
+            (int)
+        """
+        self._generation += 1
+        self._current_hash = self.hash_current_board(board)
+        return self._current_hash
+
+    def _toggle_piece(self, square: chess.Square, piece: chess.Piece) -> None:
+        """
+        XORs piece at square in/out of current_hash
+
+        Args:
+            square (chess.Square): square of piece
+            piece (chess.Piece): piece to toggle
+        """
+        piece_idx = _PIECE_IDX_LUT[piece.piece_type, int(piece.color)]
+        self._current_hash ^= int(self._hash_table[piece_idx, square])
+
+    def update_hash(self, move: chess.Move, board_before: chess.Board) -> int:
+        """
+        Incrementally updates current_hash with move rather than rehashing
+        entire board. Since XOR is its own inverse, calling this again with
+        the same move and board after popping the move restores the
+        previous hash. Assumes the zobrist hashing schema
+
+        Args:
+            move (chess.Move): move to be played
+            board_before (chess.Board): board state BEFORE move is pushed
+        Returns:
+            (int): hash of board after move
+        """
+        # Null moves don't change piece placement
+        if not move:
+            return self._current_hash
+
+        piece = board_before.piece_at(move.from_square)
+        from_square, to_square = move.from_square, move.to_square
+
+        if board_before.is_castling(move):
+            # Move both king and rook. python-chess encodes castling as king
+            # to destination square or, in chess960, king takes own rook
+            rank = chess.square_rank(from_square)
+            kingside = board_before.is_kingside_castling(move)
+            if board_before.piece_type_at(to_square) == chess.ROOK:
+                rook_from = to_square
+            else:
+                rook_from = chess.square(7 if kingside else 0, rank)
+            rook_to = chess.square(5 if kingside else 3, rank)
+            to_square = chess.square(6 if kingside else 2, rank)
+
+            rook = chess.Piece(chess.ROOK, piece.color)
+            self._toggle_piece(rook_from, rook)
+            self._toggle_piece(rook_to, rook)
+        elif board_before.is_en_passant(move):
+            # Captured pawn sits behind destination square
+            captured_square = to_square + (-8 if piece.color else 8)
+            self._toggle_piece(
+                captured_square, chess.Piece(chess.PAWN, not piece.color)
+            )
+        else:
+            captured = board_before.piece_at(to_square)
+            if captured:
+                self._toggle_piece(to_square, captured)
+
+        self._toggle_piece(from_square, piece)
+        if move.promotion:
+            piece = chess.Piece(move.promotion, piece.color)
+        self._toggle_piece(to_square, piece)
+
+        return self._current_hash
+
+    def get_evaluation_from_fen(self, fen: str) -> float:
         """
         Gets evaluation of position via. FEN string if position evaluation
         stored
@@ -105,12 +498,13 @@ class TranspositionTable:
         Args:
             fen (str): FEN of board state
         Returns:
-            (int)
+            (float)
         """
         if is_valid_fen(fen):
             hash_ = self.hash_current_board(chess.Board(fen=fen))
-            if hash_ in self.stored_values:
-                return self.stored_values[hash_]
+            evaluation = self.get(hash_)
+            if evaluation is not None:
+                return evaluation
         return False
 
     def store_current_board(self, board: chess.Board) -> None:
@@ -121,5 +515,8 @@ class TranspositionTable:
             board (chess.Board): board state
         """
         hash_ = self.hash_current_board(board)
-        evaluation = self.evaluation_function().evaluate(board)
-        self.stored_values[hash_] = evaluation
+        evaluation = self._evaluator.evaluate(board)
+        # Evaluator is reused, so drop the history it records per board to
+        # keep memory bounded by the table
+        self._evaluator.evaluations.clear()
+        self[hash_] = evaluation
@@ -91,7 +91,9 @@ def get_piece_at(
     board: chess.Board, position: Union[str, chess.Square]
 ) -> str:
     """
-    Gets chess symbol of piece at position on board
+    Gets chess symbol of piece at position on board. Convenience wrapper
+    for user facing code - since it builds the symbol string, prefer
+    board.piece_type_at & board.color_at in hot loops
 
     Args:
         board (chess.Board): current board state in python-chess object
@@ -1,5 +1,7 @@
 """ Test suite for assortment of analysis functions """
+import pickle
 import sys
+from typing import Dict, List, Union
 
 import chess  # type: ignore
 import chess.pgn  # type: ignore
@@ -7,17 +9,47 @@ import pytest  # type: ignore
 
 from chessmate.analysis import *
 from chessmate.engines import AvoidCapture, MiniMax, Random
+from chessmate.transpositions import TranspositionTable, zobrist_hash_function
 from chessmate.utils import load_fen
 
 sys.path.append("..")
 
 
+# Load and parse each FEN used in tests once and store pickled boards by FEN
+# name, since unpickling a board is much faster than reading the FEN
+# fixtures file and parsing the FEN again. FEN names mapping to a list of
+# FENs are stored as a pickled list of boards
+_BOARD_CACHE: Dict[str, bytes] = {}
+for _fen_name in (
+    "in_progress_fen",
+    "not_mated_fens",
+    "stalemate_fen",
+    "white_to_mate",
+):
+    _fens = load_fen(_fen_name)
+    if isinstance(_fens, list):
+        _boards = [chess.Board(fen=fen) for fen in _fens]
+    else:
+        _boards = chess.Board(fen=_fens)
+    _BOARD_CACHE[_fen_name] = pickle.dumps(_boards)
+
+
+def load_board(fen_name: str) -> Union[chess.Board, List[chess.Board]]:
+    """
+    Loads fresh copy of board(s) from _BOARD_CACHE
 
+    Args:
+        fen_name (str): name of predefined FEN in _BOARD_CACHE
+    Returns:
+        (Union[chess.Board, List[chess.Board]])
+    """
+    return pickle.loads(_BOARD_CACHE[fen_name])
 
-@pytest.fixture
-def starting_board():
+
+@pytest.fixture(scope="session")
+def _starting_board_template():
     """
-    Set ups empty board for each test
+    Set ups starting board once per session. Use starting_board in tests
 
     Returns:
         (chess.Board)
@@ -28,19 +60,32 @@ def starting_board():
 
 
 @pytest.fixture
+def starting_board(_starting_board_template):
+    """
+    Set ups empty board for each test. Copied from template since tests
+    modify board
+
+    Returns:
+        (chess.Board)
+    """
+    return _starting_board_template.copy()
+
+
+@pytest.fixture(scope="session")
 def in_progress_board():
     """
-    Set ups board of an in progress game
+    Set ups board of an in progress game. Session scoped since tests
+    only read board
 
     Returns:
         (chess.Board)
     """
 
-    board = chess.Board(fen=load_fen("in_progress_fen"))
+    board = load_board("in_progress_fen")
     return board
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def not_mated_boards():
     """
     Sets up boards that ended due to resignation
@@ -49,10 +94,10 @@ def not_mated_boards():
         List[chess.Board]
     """
 
-    return [chess.Board(fen=f) for f in load_fen("not_mated_fens")]
+    return load_board("not_mated_fens")
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def stalemate_boards():
     """
     Sets up boards that ended due to stalemate
@@ -60,10 +105,10 @@ def stalemate_boards():
     Returns:
         List[chess.Board]
     """
-    return [chess.Board(fen=load_fen("stalemate_fen"))]
+    return [load_board("stalemate_fen")]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def evaluation_engines():
     """
     Sets up evaluation engines
@@ -74,9 +119,38 @@ def evaluation_engines():
     return [StandardEvaluation(), PiecePositionEvaluation()]
 
 
+@pytest.fixture(scope="module")
+def _evaluation_engines_minimax():
+    """
+    Sets up engines for get_engine_evaluations once per module. Use
+    evaluation_engines_minimax in tests
+
+    Returns:
+        (Tuple)
+    """
+    return (Random(), AvoidCapture(), MiniMax(color=chess.WHITE, depth=1))
+
+
+@pytest.fixture
+def evaluation_engines_minimax(_evaluation_engines_minimax):
+    """
+    Resets engines shared across module for each test. MiniMax is given a
+    fresh transposition table so stored evaluations don't carry over
+    between tests
+
+    Returns:
+        (Tuple)
+    """
+    for engine in _evaluation_engines_minimax:
+        engine.reset_game_variables()
+    minimax = _evaluation_engines_minimax[-1]
+    minimax.transposition_table = TranspositionTable(zobrist_hash_function)
+    return _evaluation_engines_minimax
+
+
 def test_evaluate_ending_for_white_win_position():
     """ Tests that boards correspond to mate are correctly evaluated """
-    white_to_mate = chess.Board(fen=load_fen("white_to_mate"))
+    white_to_mate = load_board("white_to_mate")
     white_to_mate.push_uci("d3e4")
 
     assert evaluate_ending_board(white_to_mate) == "White win by mate"
@@ -169,31 +243,27 @@ def test_get_engine_evaluation_wrong_input():
         get_engine_evaluations(0)
 
 
-def test_get_engine_evaluation_runs_with_board_input():
+def test_get_engine_evaluation_runs_with_board_input(
+    evaluation_engines_minimax,
+):
     """ Tests that get_engine_evaluations will evaluate given chess.board as
     input
     """
-    eval_ = get_engine_evaluations(
-        chess.Board(),
-        Random(),
-        AvoidCapture(),
-        MiniMax(color=chess.WHITE, depth=1),
-    )
+    eval_ = get_engine_evaluations(chess.Board(), *evaluation_engines_minimax)
     # Check that each engine evaluated
     assert set(["Random", "Avoid Capture", "MiniMax"]) == set(eval_.keys())
     # Check that evaluations from each engine are legal chess moves
     assert all(len(v) == 4 for v in eval_.values())
 
 
-def test_get_engine_evaluation_runs_with_fen_input():
+def test_get_engine_evaluation_runs_with_fen_input(
+    evaluation_engines_minimax,
+):
     """ Tests that get_engine_evaluations will evaluate given FEN as
     input
     """
     eval_ = get_engine_evaluations(
-        load_fen("starting_fen"),
-        Random(),
-        AvoidCapture(),
-        MiniMax(color=chess.WHITE, depth=1),
+        load_fen("starting_fen"), *evaluation_engines_minimax
     )
     # Check that each engine evaluated
     assert set(["Random", "Avoid Capture", "MiniMax"]) == set(eval_.keys())
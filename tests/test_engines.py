@@ -277,3 +277,15 @@ def test_minimax_no_pruning_captures_obvious_pieces(minimax_engines):
 
     board = chess.Board(fen=load_fen("capture_white_queen_2"))
     assert str(black_minimax.move(board)) == "c4f4"
+
+
+def test_minimax_called_directly_hashes_from_given_board(minimax_engines):
+    """ Tests that minimax seeds incremental hash from board passed in
+    rather than last board evaluated via. move """
+    engine = minimax_engines[0]
+    engine.move(chess.Board())
+
+    board = chess.Board(fen=load_fen("capture_black_queen_2"))
+    engine.minimax(board, True, 1, engine.alpha, engine.beta)
+    table = engine.transposition_table
+    assert table.current_hash == table.hash_current_board(board)
@@ -1,20 +1,18 @@
 """ Tests for transposition table functionality """
-import random
 import sys
 
 sys.path.append("..")
 
 import chess  # type: ignore
+import numpy as np  # type: ignore
 import pytest  # type: ignore
 
+from chessmate import transpositions
 from chessmate.analysis import PiecePositionEvaluation
+from chessmate.constants.misc import PIECE_INDEXING
 from chessmate.transpositions import *
 
 
-# Since hashes are randomly generated, seed hashed for tests for consistency
-random.seed(42)
-
-
 @pytest.fixture
 def known_zobrist_hash():
     """
@@ -22,12 +20,11 @@ def known_zobrist_hash():
 
     Returns:
         (Int): seeded starting board hash
-        (List): seeded hash table
+        (np.ndarray): seeded hash table
     """
-    hash_table = [
-        [[random.randint(1, 2 ** 64 - 1) for i in range(12)] for j in range(8)]
-        for k in range(8)
-    ]
+    hash_table = np.random.default_rng(42).integers(
+        1, 1 << 64, size=(12, 64), dtype=np.uint64
+    )
     known_starting_hash = zobrist_hash_function(chess.Board(), hash_table)
 
     return known_starting_hash, hash_table
@@ -130,6 +127,28 @@ def test_zobrist_hash_function_side_invariate(known_zobrist_hash):
     assert white_play_hash == black_play_hash
 
 
+@pytest.mark.parametrize(
+    "square,symbol", [(chess.A1, "K"), (chess.E4, "q"), (chess.H8, "n")]
+)
+def test_zobrist_hash_function_single_piece_indexes_square(
+    known_zobrist_hash, square, symbol
+):
+    """ Tests that hash of a board with a single piece is the hash table
+    value indexed directly by piece index and square """
+    board = chess.Board(fen=None)
+    board.set_piece_at(square, chess.Piece.from_symbol(symbol))
+    _hash = zobrist_hash_function(board, known_zobrist_hash[1])
+
+    assert _hash == known_zobrist_hash[1][PIECE_INDEXING[symbol], square]
+
+
+def test_zobrist_hash_function_empty_board(known_zobrist_hash):
+    """ Tests that zobrist hash function returns 0 for a board with
+    no pieces on it """
+    _hash = zobrist_hash_function(chess.Board(fen=None), known_zobrist_hash[1])
+    assert _hash == 0
+
+
 def test_transposition_table_stores_zobrist_hash(known_zobrist_hash):
     """ Tests that TranspositionTable stores zobrist hash in table """
     # Initialize table w/ defined hash function
@@ -151,6 +170,19 @@ def test_transposition_table_contains_works(known_zobrist_hash):
     assert known_zobrist_hash[0] in table
 
 
+def test_transposition_table_contains_raises_typeerror_for_str_hash(
+    known_zobrist_hash,
+):
+    """ Tests that __contains__ in TranspositionTable raises TypeError for
+    str hashes rather than silently never matching """
+    table = TranspositionTable(zobrist_hash_function)
+    table.hash_table = known_zobrist_hash[1]
+    table.store_current_board(chess.Board())
+
+    with pytest.raises(TypeError):
+        str(known_zobrist_hash[0]) in table
+
+
 def test_transposition_table_with_random_hash_stores_data():
     """ Tests that uses a random hash table as is called in the __init__
     successfully stores the hashing of a random board """
@@ -269,3 +301,207 @@ def test_transposition_table_evaluate_from_fen(known_zobrist_hash):
     # evaluation is returned
     returned_eval = table.get_evaluation_from_fen(opening_sequence_fen)
     assert returned_eval in table.stored_values.values()
+
+
+@pytest.mark.parametrize(
+    "fen,uci",
+    [
+        (chess.STARTING_FEN, "e2e4"),
+        ("4k3/8/8/3p4/4P3/8/8/4K3 w - - 0 1", "e4d5"),
+        ("r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1", "e1g1"),
+        ("r3k2r/8/8/8/8/8/8/R3K2R b KQkq - 0 1", "e8c8"),
+        ("4k3/8/8/3pP3/8/8/8/4K3 w - d6 0 1", "e5d6"),
+        ("1n2k3/P7/8/8/8/8/8/4K3 w - - 0 1", "a7b8q"),
+    ],
+)
+def test_transposition_table_update_hash_matches_full_hash(
+    known_zobrist_hash, fen, uci
+):
+    """ Tests that incrementally updated hash is identical to hashing
+    board after move from scratch for quiet moves, captures, castling,
+    en passant and promotions """
+    table = TranspositionTable(zobrist_hash_function)
+    table.hash_table = known_zobrist_hash[1]
+    board = chess.Board(fen=fen)
+    table.set_current_board(board)
+
+    move = chess.Move.from_uci(uci)
+    updated_hash = table.update_hash(move, board)
+    board.push(move)
+
+    assert updated_hash == table.hash_current_board(board)
+
+
+def test_transposition_table_update_hash_undo_restores_hash(
+    known_zobrist_hash,
+):
+    """ Tests that updating hash with same move after popping it restores
+    the hash of the board before the move """
+    table = TranspositionTable(zobrist_hash_function)
+    table.hash_table = known_zobrist_hash[1]
+    board = chess.Board()
+    starting_hash = table.set_current_board(board)
+
+    for uci in ("e2e4", "d7d5", "e4d5", "d8d5"):
+        move = chess.Move.from_uci(uci)
+        table.update_hash(move, board)
+        board.push(move)
+    while board.move_stack:
+        table.update_hash(board.pop(), board)
+
+    assert table.current_hash == starting_hash
+
+
+def test_zobrist_xor_jit_kernel_matches_numpy_kernel(known_zobrist_hash):
+    """ Tests that numba compiled XOR kernel hashes identically to numpy
+    fallback kernel. Skipped if numba not installed """
+    pytest.importorskip("numba")
+    hash_table = known_zobrist_hash[1]
+    random_raw = np.random.default_rng(0).bit_generator.random_raw
+    sparse_bitboards = random_raw(12) & random_raw(12) & random_raw(12)
+    for bitboards in (
+        np.zeros(12, dtype=np.uint64),
+        random_raw(12),
+        sparse_bitboards,
+    ):
+        assert transpositions._zobrist_xor_jit(
+            bitboards, hash_table
+        ) == transpositions._zobrist_xor_numpy(bitboards, hash_table)
+
+
+@pytest.mark.parametrize("size", [0, 2, 6, 100])
+def test_transposition_table_invalid_size_raises_valueerror(size):
+    """ Tests that table sizes that aren't powers of 2 at least BUCKET_SIZE
+    large raise ValueError """
+    with pytest.raises(ValueError):
+        TranspositionTable(zobrist_hash_function, size=size)
+
+
+def test_transposition_table_evicts_least_accessed_entry():
+    """ Tests that storing a hash in a full bucket evicts the least
+    frequently accessed entry and keeps table size bounded """
+    table = TranspositionTable(zobrist_hash_function, size=BUCKET_SIZE)
+    for hash_val in range(1, BUCKET_SIZE + 1):
+        table[hash_val] = hash_val
+    # Access every entry except the first
+    for hash_val in range(2, BUCKET_SIZE + 1):
+        assert table[hash_val] == hash_val
+
+    table[BUCKET_SIZE + 1] = 0
+
+    assert len(table) == BUCKET_SIZE
+    assert 1 not in table
+    assert table[BUCKET_SIZE + 1] == 0
+
+
+def test_transposition_table_ages_access_counts_per_search():
+    """ Tests that entries accessed in previous searches age out rather than
+    new entries evicting each other """
+    table = TranspositionTable(zobrist_hash_function, size=BUCKET_SIZE)
+    for hash_val in range(1, BUCKET_SIZE + 1):
+        table[hash_val] = hash_val
+        for _ in range(3):
+            table.get(hash_val)
+    # Counts of 4 halve to 0 after 3 new searches
+    for _ in range(3):
+        table.set_current_board(chess.Board())
+
+    table[BUCKET_SIZE + 1] = 0
+    table[BUCKET_SIZE + 2] = 0
+
+    assert BUCKET_SIZE + 1 in table
+    assert BUCKET_SIZE + 2 in table
+
+
+@pytest.mark.parametrize("evaluation", [0.75, -2.5, float("inf")])
+def test_transposition_table_stores_float_evaluations(evaluation):
+    """ Tests that non integer evaluations are stored without truncation """
+    table = TranspositionTable(zobrist_hash_function)
+    table[1] = evaluation
+
+    assert table[1] == evaluation
+    assert table.stored_values == {1: evaluation}
+
+
+def test_transposition_table_get_returns_none_if_not_stored():
+    """ Tests that get returns stored evaluation via. a single lookup and
+    None for hashes not stored """
+    table = TranspositionTable(zobrist_hash_function)
+    table[1] = 3
+
+    assert table.get(1) == 3
+    assert table.get(2) is None
+
+
+def test_transposition_table_stored_values_read_only():
+    """ Tests that writing to stored_values raises rather than silently
+    writing to a snapshot """
+    table = TranspositionTable(zobrist_hash_function)
+    with pytest.raises(TypeError):
+        table.stored_values[1] = 0
+
+
+def test_transposition_table_reuses_evaluation_function_instance():
+    """ Tests that evaluation function is instantiated when set rather than
+    for each stored board """
+    table = TranspositionTable(zobrist_hash_function)
+    table.evaluation_function = PiecePositionEvaluation
+    evaluator = table._evaluator
+
+    table.store_current_board(chess.Board())
+    table.store_current_board(
+        chess.Board(fen="8/8/8/3kq3/8/8/4Q3/4K3 w - - 0 1")
+    )
+
+    assert table._evaluator is evaluator
+
+
+@pytest.mark.parametrize(
+    "hash_table",
+    [
+        np.zeros((64, 12), dtype=np.uint64),
+        np.zeros((12, 64), dtype=np.int64),
+        np.zeros((8, 8, 12), dtype=np.uint64).tolist(),
+    ],
+)
+def test_transposition_table_invalid_hash_table_raises_valueerror(
+    hash_table,
+):
+    """ Tests that hash tables of legacy layouts or wrong dtype are rejected
+    rather than silently producing wrong hashes """
+    table = TranspositionTable(zobrist_hash_function)
+    with pytest.raises(ValueError):
+        table.hash_table = hash_table
+
+
+def test_transposition_table_hash_table_made_contiguous(known_zobrist_hash):
+    """ Tests that non contiguous hash tables are copied to contiguous
+    tables and hash identically """
+    table = TranspositionTable(zobrist_hash_function)
+    table.hash_table = np.asfortranarray(known_zobrist_hash[1])
+
+    assert table.hash_table.flags["C_CONTIGUOUS"]
+    assert table.hash_current_board(chess.Board()) == known_zobrist_hash[0]
+
+
+def test_transposition_tables_with_same_seed_hash_identically():
+    """ Tests that tables generated with the same seed produce the same
+    hashes and tables with different seeds don't """
+    board = chess.Board()
+    tables = [
+        TranspositionTable(zobrist_hash_function, seed=seed)
+        for seed in (0, 0, 1)
+    ]
+    seeded_hashes = [table.hash_current_board(board) for table in tables]
+
+    assert seeded_hashes[0] == seeded_hashes[1]
+    assert seeded_hashes[0] != seeded_hashes[2]
+
+
+def test_transposition_table_without_seed_random_hash_table():
+    """ Tests that tables generated without a seed have different
+    hash tables """
+    table1 = TranspositionTable(zobrist_hash_function, seed=None)
+    table2 = TranspositionTable(zobrist_hash_function, seed=None)
+
+    assert not np.array_equal(table1.hash_table, table2.hash_table)
@@ -41,10 +41,11 @@ def in_progress_board():
     return board
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def setup_playground():
     """
-    Sets up test playground with 3 games played
+    Sets up test playground with 3 games played. Module scoped since tests
+    only read played games
 
     Returns:
             (ChessPlaygound)
@@ -54,7 +55,7 @@ def setup_playground():
     return playground
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def setup_piece_tables():
     """ Sets ups all defined piece tables """
     return [